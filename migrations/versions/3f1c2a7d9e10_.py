@@ -0,0 +1,30 @@
+"""widen user.password to fit password hashes
+
+Revision ID: 3f1c2a7d9e10
+Revises: b4934d4b9ab3
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a7d9e10'
+down_revision = 'b4934d4b9ab3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column('user', 'password',
+               existing_type=sa.String(length=80),
+               type_=sa.String(length=255),
+               existing_nullable=False)
+
+
+def downgrade():
+    op.alter_column('user', 'password',
+               existing_type=sa.String(length=255),
+               type_=sa.String(length=80),
+               existing_nullable=False)
@@ -0,0 +1,64 @@
+"""
+Measures /login throughput under concurrent load, hashing inline in the request thread
+and hashing in the process pool from src/security.py, so both numbers can be compared.
+Don't expect the pool to win: hashlib.pbkdf2_hmac already releases the GIL, and sync gunicorn
+workers wait on the result anyway. What the pool buys is a cap on how many CPUs each web worker
+spends hashing at the same time (PASSWORD_HASH_WORKERS), so a burst of logins can't starve other requests.
+Run it from the project folder with: $ pipenv run python scripts/benchmark_login.py [threads] [requests]
+It uses a temporary sqlite database (deleted at exit), so your .env database is not touched.
+"""
+import os
+import sys
+import time
+import atexit
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import check_password_hash
+
+THREADS = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+REQUESTS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+
+def login(i):
+    client = main.app.test_client()
+    response = client.post('/login', json={"username": "user%d" % (i % 10), "password": "secret"})
+    return response.status_code
+
+
+def run(label):
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        codes = list(executor.map(login, range(REQUESTS)))
+    elapsed = time.time() - start
+    print("%-7s %d logins with %d threads in %.2fs: %.1f logins/s (%d failed)" % (label, REQUESTS, THREADS, elapsed, REQUESTS / elapsed, len([c for c in codes if c != 200])))
+
+
+# everything below only runs in the parent, the hashing processes import this file as __mp_main__
+if __name__ == '__main__':
+    TMP_DIR = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, TMP_DIR, True)
+    os.environ['DB_CONNECTION_STRING'] = 'sqlite:///' + os.path.join(TMP_DIR, 'benchmark.db')
+    os.environ.setdefault('TOKEN_KEY', 'benchmark key long enough for the HS256 signature')
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+    import main
+    import security
+    from main import app
+    from models import db, User
+
+    print("%d CPUs, %d hashing processes per web worker, %d pbkdf2 rounds" % (os.cpu_count() or 1, security.HASH_WORKERS, security.HASH_ROUNDS))
+    with app.app_context():
+        db.create_all()
+        for i in range(10):
+            db.session.add(User(public_id=str(i), username="user%d" % i, password=security.hash_password("secret")))
+        db.session.commit()
+
+    # inline: verify in the request thread, the way login worked before the process pool
+    pooled_verify = main.verify_password
+    main.verify_password = check_password_hash
+    run("inline")
+
+    main.verify_password = pooled_verify
+    run("pooled")
@@ -9,6 +9,7 @@ from flask_cors import CORS #to avoid CORS (Cross-Origin Resource Sharing) domai
 from utils import APIException, generate_sitemap
 from admin import setup_admin
 from models import db, User, Character, Planet, Favorite
+from security import hash_password, verify_password, needs_rehash, DUMMY_HASH
 
 
 ###########
@@ -64,7 +65,6 @@ def get_all_user():
         user_data["id"] = user.id #borrar luego para efectos de privacidad backend
         user_data["public_id"] = user.public_id
         user_data["username"] = user.username
-        user_data["password"] = user.password
         user_data["admin"] = user.admin
         output.append(user_data)
     
@@ -81,7 +81,6 @@ def get_single_user(public_id):
     user_data= {}
     user_data["public_id"] = user.public_id
     user_data["username"] = user.username
-    user_data["password"] = user.password
     user_data["admin"] = user.admin
     user_data["id"]= user.id
 
@@ -91,8 +90,11 @@ def get_single_user(public_id):
 def create_user():
     request_body = request.get_json()
 
-    # hashed_password = generate_password_hash(request_body["password"], method='sha256')
-    new_user = User(public_id= str(uuid.uuid4()), username = request_body["username"], password=request_body["password"], email=request_body["email"], admin=False)
+    if not isinstance(request_body["password"], str):
+        raise APIException('Password must be a string', status_code=400)
+
+    hashed_password = hash_password(request_body["password"])
+    new_user = User(public_id= str(uuid.uuid4()), username = request_body["username"], password=hashed_password, email=request_body["email"], admin=False)
 
     db.session.add(new_user)
     db.session.commit()
@@ -305,11 +307,25 @@ def login():
     username = request.json.get("username", None)
     password = request.json.get("password", None)
 
-    user = User.query.filter_by(username=username, password=password).first()
+    if username is None or not isinstance(password, str):
+        return jsonify({"msg": "Bad username or password"}), 401
+
+    user = User.query.filter_by(username=username).first()   #username is unique, so this lookup uses its index
 
     if user is None:
+        verify_password(DUMMY_HASH, password)   #hash anyway so unknown usernames can't be told apart by response time
         return jsonify({"msg": "Bad username or password"}), 401
 
+    if not verify_password(user.password, password):
+        return jsonify({"msg": "Bad username or password"}), 401
+
+    if needs_rehash(user.password):   #upgrade plain text or old work factor passwords on a successful login
+        try:
+            user.password = hash_password(password)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()   #the password was already verified, the upgrade will be retried on a later login
+
     access_token = create_access_token(identity=username)
     return jsonify(access_token=access_token)
 
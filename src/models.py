@@ -11,7 +11,7 @@ class User(db.Model):
     public_id = db.Column(db.String(120), unique=True)
     username = db.Column(db.String(120), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True)
-    password = db.Column(db.String(80), unique=False, nullable=False)
+    password = db.Column(db.String(255), unique=False, nullable=False)
     is_active = db.Column(db.Boolean(), unique=False, default=True)
     admin = db.Column(db.Boolean(), default=False)
     favorites = db.relationship('Favorite', backref='User') # One to Many
@@ -0,0 +1,82 @@
+"""
+Password hashing helpers. Hashing and verification are CPU bound, so they run in a
+small process pool that caps how much CPU each web worker spends on pbkdf2 at the same time.
+"""
+import os
+import hmac
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# work factor (pbkdf2 iterations), fetched from .env so it can be raised over time
+HASH_ROUNDS = int(os.environ.get('PASSWORD_HASH_ROUNDS', 260000))
+# max number of processes hashing at the same time, per web worker process (each gunicorn worker has its own pool)
+HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+HASH_ALGORITHM = 'pbkdf2:sha256'
+HASH_METHOD = '%s:%d' % (HASH_ALGORITHM, HASH_ROUNDS)
+# never matches a password, verified against when the username does not exist so that login takes the same time
+DUMMY_HASH = '%s$%s$%s' % (HASH_METHOD, 'x' * 16, '0' * 64)
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    # created lazily and per process, so every gunicorn worker gets its own pool after the fork
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            # forkserver instead of fork, forking an already threaded web worker can deadlock
+            _pool = ProcessPoolExecutor(max_workers=HASH_WORKERS, mp_context=multiprocessing.get_context('forkserver'))
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _drop_pool(broken_pool):
+    # forget a pool whose worker died (e.g. killed by the OOM killer) so the next call builds a new one
+    global _pool
+    with _pool_lock:
+        if _pool is broken_pool:
+            _pool = None
+    broken_pool.shutdown(wait=False)
+
+
+def _run(fn, *args):
+    pool = _get_pool()
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        _drop_pool(pool)
+        return _get_pool().submit(fn, *args).result()
+
+
+def _hash(password):
+    return generate_password_hash(password, method=HASH_METHOD)
+
+
+def is_hashed(stored_password):
+    return stored_password.startswith('pbkdf2:') and stored_password.count('$') == 2
+
+
+def needs_rehash(stored_password):
+    # plain text rows and hashes weaker than the current work factor get upgraded on the next login
+    if not is_hashed(stored_password):
+        return True
+    algorithm, _, rounds = stored_password.split('$', 1)[0].rpartition(':')
+    if algorithm != HASH_ALGORITHM or not rounds.isdigit():
+        return True
+    return int(rounds) < HASH_ROUNDS
+
+
+def hash_password(password):
+    return _run(_hash, password)
+
+
+def verify_password(stored_password, password):
+    if not is_hashed(stored_password):
+        # legacy row saved in plain text before hashing was turned on, no need to leave this process
+        return hmac.compare_digest(stored_password.encode('utf-8'), password.encode('utf-8'))
+    return _run(check_password_hash, stored_password, password)
@@ -0,0 +1,19 @@
+import os
+import sys
+import shutil
+import tempfile
+
+import pytest
+
+# must be set before main/security are imported, they read them at import time
+TMP_DIR = tempfile.mkdtemp()
+os.environ['DB_CONNECTION_STRING'] = 'sqlite:///' + os.path.join(TMP_DIR, 'test.db')
+os.environ['TOKEN_KEY'] = 'test key long enough for the HS256 signature'
+os.environ['PASSWORD_HASH_ROUNDS'] = '1000'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+
+@pytest.fixture(scope='session', autouse=True)
+def remove_tmp_dir():
+    yield
+    shutil.rmtree(TMP_DIR, True)
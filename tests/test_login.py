@@ -0,0 +1,131 @@
+import os
+import signal
+import threading
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+import security
+from main import app
+from models import db, User
+
+
+@pytest.fixture
+def client():
+    with app.app_context():
+        db.create_all()
+    yield app.test_client()
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+def add_user(username, password):
+    with app.app_context():
+        db.session.add(User(public_id=username, username=username, password=password))
+        db.session.commit()
+
+
+def stored_password(username):
+    with app.app_context():
+        return User.query.filter_by(username=username).first().password
+
+
+def test_hash_round_trip():
+    hashed = security.hash_password("secret")
+    assert hashed.startswith(security.HASH_METHOD + "$")
+    assert security.verify_password(hashed, "secret")
+    assert not security.verify_password(hashed, "wrong")
+
+
+def test_needs_rehash():
+    assert security.needs_rehash("secret")
+    assert security.needs_rehash(generate_password_hash("secret", method="pbkdf2:sha256:500"))
+    assert not security.needs_rehash(security.hash_password("secret"))
+    # a stronger hash is never downgraded when PASSWORD_HASH_ROUNDS is lowered
+    assert not security.needs_rehash(generate_password_hash("secret", method="pbkdf2:sha256:2000"))
+
+
+def test_create_user_stores_hash(client):
+    response = client.post('/user', json={"username": "luke", "password": "secret", "email": "luke@jedi.com"})
+    assert response.status_code == 200
+    assert security.is_hashed(stored_password("luke"))
+    assert client.post('/login', json={"username": "luke", "password": "secret"}).status_code == 200
+
+
+def test_user_endpoints_hide_password(client):
+    add_user("leia", security.hash_password("secret"))
+    users = client.get('/user').get_json()["users"]
+    assert "password" not in users[0]
+    assert "password" not in client.get('/user/leia').get_json()["user"]
+
+
+def test_legacy_plaintext_login_is_rehashed(client):
+    add_user("han", "secret")
+    response = client.post('/login', json={"username": "han", "password": "secret"})
+    assert response.status_code == 200
+    assert "access_token" in response.get_json()
+    assert stored_password("han").startswith(security.HASH_METHOD + "$")
+
+
+def test_old_work_factor_is_upgraded(client):
+    add_user("chewie", generate_password_hash("secret", method="pbkdf2:sha256:500"))
+    assert client.post('/login', json={"username": "chewie", "password": "secret"}).status_code == 200
+    assert stored_password("chewie").startswith(security.HASH_METHOD + "$")
+
+
+def test_bad_credentials_return_401(client):
+    add_user("yoda", security.hash_password("secret"))
+    assert client.post('/login', json={"username": "yoda", "password": "wrong"}).status_code == 401
+    assert client.post('/login', json={"username": "nobody", "password": "secret"}).status_code == 401
+    assert client.post('/login', json={"username": "yoda"}).status_code == 401
+    assert client.post('/login', json={"password": "secret"}).status_code == 401
+    assert client.post('/login', json={"username": "yoda", "password": 123}).status_code == 401
+    assert client.post('/login', json={"username": "yoda", "password": ["x"]}).status_code == 401
+    add_user("obiwan", "secret")
+    assert client.post('/login', json={"username": "obiwan", "password": 123}).status_code == 401
+
+
+def test_create_user_rejects_non_string_password(client):
+    response = client.post('/user', json={"username": "luke", "password": 5, "email": "luke@jedi.com"})
+    assert response.status_code == 400
+
+
+def test_unknown_user_still_hashes(client, monkeypatch):
+    calls = []
+    run = security._run
+
+    def recording_run(fn, *args):
+        calls.append(args[0])
+        return run(fn, *args)
+
+    monkeypatch.setattr(security, "_run", recording_run)
+    assert client.post('/login', json={"username": "nobody", "password": "secret"}).status_code == 401
+    assert calls == [security.DUMMY_HASH]
+
+
+def test_pool_is_created_once_under_concurrency():
+    security._get_pool()
+    with security._pool_lock:
+        security._pool.shutdown(wait=False)
+        security._pool = None
+    barrier = threading.Barrier(16)
+    pools = []
+
+    def get():
+        barrier.wait()
+        pools.append(security._get_pool())
+
+    threads = [threading.Thread(target=get) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(map(id, pools))) == 1
+
+
+def test_pool_recovers_after_worker_is_killed():
+    pool = security._get_pool()
+    security.hash_password("secret")
+    os.kill(next(iter(pool._processes)), signal.SIGKILL)
+    assert security.verify_password(security.hash_password("secret"), "secret")